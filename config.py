@@ -10,66 +10,197 @@ Date: August 20, 2025
 """
 
 import os
+import copy
+from dataclasses import dataclass, fields
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import json
 
+# orjson is optional; fall back to the standard library when it is not installed
+try:
+    import orjson
+    
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Default configuration
+DEFAULT_CONFIG = {
+    'openai': {
+        'api_key': None,
+        'model': 'gpt-5',
+        'deployment_name': 'gpt 5',  # Azure deployment name
+        'max_tokens': 4000,
+        'temperature': 0.3,
+        'timeout': 60
+    },
+    'teams': {
+        'webhook_url': None,
+        'channel_name': 'Release Notes',
+        'mention_users': [],
+        'enable_notifications': True
+    },
+    'git': {
+        'default_branch': 'main',
+        'ignore_patterns': ['.git', '__pycache__', '*.pyc', '.env'],
+        'file_extensions': ['.py', '.js', '.ts', '.java', '.go', '.cpp', '.h']
+    },
+    'monitoring': {
+        'interval_seconds': 300,  # 5 minutes
+        'max_commits_per_check': 10,
+        'enable_continuous_mode': True
+    },
+    'output': {
+        'log_level': 'INFO',
+        'log_file': 'release_notes.log',
+        'backup_readme': True,
+        'output_format': 'markdown'
+    }
+}
+
+# Environment variables that override configuration values: (variable, config path, type)
+ENV_OVERRIDES = [
+    ('OPENAI_API_KEY', ('openai', 'api_key'), str),
+    ('OPENAI_MODEL', ('openai', 'model'), str),
+    ('OPENAI_DEPLOYMENT_NAME', ('openai', 'deployment_name'), str),
+    ('TEAMS_WEBHOOK_URL', ('teams', 'webhook_url'), str),
+    ('TEAMS_CHANNEL_NAME', ('teams', 'channel_name'), str),
+    ('GIT_DEFAULT_BRANCH', ('git', 'default_branch'), str),
+    ('MONITORING_INTERVAL', ('monitoring', 'interval_seconds'), int),
+    ('LOG_LEVEL', ('output', 'log_level'), str),
+]
+_ENV_BY_PATH = {path: (name, cast) for name, path, cast in ENV_OVERRIDES}
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file; keyed on mtime and size so edits invalidate the entry."""
+    return _json_loads(Path(path).read_bytes())
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """Immutable, slot-based copy of every setting, for hot paths that read config repeatedly."""
+    openai_api_key: Optional[str]
+    openai_model: str
+    openai_deployment_name: str
+    openai_max_tokens: int
+    openai_temperature: float
+    openai_timeout: int
+    teams_webhook_url: Optional[str]
+    teams_channel_name: str
+    teams_mention_users: list
+    teams_enable_notifications: bool
+    git_default_branch: str
+    git_ignore_patterns: list
+    git_file_extensions: list
+    monitoring_interval: int
+    max_commits_per_check: int
+    enable_continuous_mode: bool
+    log_level: str
+    log_file: str
+    backup_readme: bool
+    output_format: str
+
+class _Setting(cached_property):
+    """A configuration value resolved on first access and cached on the instance."""
+    
+    def __init__(self, *path: str):
+        super().__init__(lambda config: config._resolve(path))
+        self.path = path
+
 class Config:
-    """Configuration manager for the Release Notes Automator."""
+    """Configuration manager for the Release Notes Automator.
+    
+    Settings are resolved lazily: the config file is only parsed, and
+    environment variables only read, for the values that are accessed.
+    
+    Each setting, the merged ``config`` dict and ``snap`` are cached on the
+    instance after first use. Edits to config.json or the environment are
+    not seen until refresh() is called, and changes made directly to
+    ``config`` do not reach the setting attributes; persist them with
+    save_config(), which refreshes the instance.
+    """
     
     def __init__(self, config_file: str = 'config.json'):
         """Initialize configuration from environment variables and config file."""
         self.config_file = Path(config_file)
-        self._load_config()
         self._validate_config()
     
-    def _load_config(self):
-        """Load configuration from environment variables and config file."""
-        # Default configuration
-        self.config = {
-            'openai': {
-                'api_key': None,
-                'model': 'gpt-5',
-                'deployment_name': 'gpt 5',  # Azure deployment name
-                'max_tokens': 4000,
-                'temperature': 0.3,
-                'timeout': 60
-            },
-            'teams': {
-                'webhook_url': None,
-                'channel_name': 'Release Notes',
-                'mention_users': [],
-                'enable_notifications': True
-            },
-            'git': {
-                'default_branch': 'main',
-                'ignore_patterns': ['.git', '__pycache__', '*.pyc', '.env'],
-                'file_extensions': ['.py', '.js', '.ts', '.java', '.go', '.cpp', '.h']
-            },
-            'monitoring': {
-                'interval_seconds': 300,  # 5 minutes
-                'max_commits_per_check': 10,
-                'enable_continuous_mode': True
-            },
-            'output': {
-                'log_level': 'INFO',
-                'log_file': 'release_notes.log',
-                'backup_readme': True,
-                'output_format': 'markdown'
-            }
-        }
+    @cached_property
+    def _file_config(self) -> Dict[str, Any]:
+        """Parsed contents of the config file, or an empty dict if it is missing."""
+        try:
+            st = self.config_file.stat()
+        except FileNotFoundError:
+            return {}
+        try:
+            return _load_config_cached(str(self.config_file), st.st_mtime_ns, st.st_size)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"Warning: Could not load config file {self.config_file}: {e}")
+            return {}
+    
+    @cached_property
+    def config(self) -> Dict[str, Any]:
+        """Full configuration: defaults, overridden by the config file, then environment variables."""
+        config = copy.deepcopy(DEFAULT_CONFIG)
+        # The parsed file is shared between instances, so merge a private copy
+        self._merge_config(config, copy.deepcopy(self._file_config))
+        self._load_from_env(config)
+        return config
+    
+    def _resolve(self, path: Tuple[str, ...]):
+        """Resolve a single setting from the environment, the config file, or the defaults."""
+        # Once the full configuration has been built it is the source of truth
+        if 'config' in self.__dict__:
+            sources = [self.config]
+        else:
+            if path in _ENV_BY_PATH:
+                name, cast = _ENV_BY_PATH[path]
+                value = os.environ.get(name)
+                if value:
+                    try:
+                        return cast(value)
+                    except ValueError:
+                        pass
+            sources = [self._file_config, DEFAULT_CONFIG]
         
-        # Load from config file if exists
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                self._merge_config(self.config, file_config)
-            except (json.JSONDecodeError, FileNotFoundError) as e:
-                print(f"Warning: Could not load config file {self.config_file}: {e}")
+        for source in sources:
+            node = source
+            for key in path:
+                if not isinstance(node, dict) or key not in node:
+                    break
+                node = node[key]
+            else:
+                # The defaults and the parsed file are shared between instances,
+                # so mutable values are handed out as private copies
+                if isinstance(node, (dict, list)):
+                    return copy.deepcopy(node)
+                return node
+        return None
+    
+    def refresh(self):
+        """Drop every cached value so settings are re-read from the file and environment on next access.
         
-        # Override with environment variables
-        self._load_from_env()
+        Unsaved changes made directly to ``config`` are discarded.
+        """
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, _Setting):
+                self.__dict__.pop(name, None)
+        for name in ('config', '_file_config', 'snap'):
+            self.__dict__.pop(name, None)
+    
+    @cached_property
+    def snap(self) -> ConfigSnapshot:
+        """Frozen snapshot of all settings; each field mirrors the upper-case attribute of the same name."""
+        return ConfigSnapshot(**{f.name: getattr(self, f.name.upper()) for f in fields(ConfigSnapshot)})
     
     def _merge_config(self, base: Dict[str, Any], override: Dict[str, Any]):
         """Recursively merge configuration dictionaries."""
@@ -79,59 +210,38 @@ class Config:
             else:
                 base[key] = value
     
-    def _load_from_env(self):
-        """Load configuration from environment variables."""
-        # OpenAI configuration
-        if os.getenv('OPENAI_API_KEY'):
-            self.config['openai']['api_key'] = os.getenv('OPENAI_API_KEY')
-        
-        if os.getenv('OPENAI_MODEL'):
-            self.config['openai']['model'] = os.getenv('OPENAI_MODEL')
-        
-        if os.getenv('OPENAI_DEPLOYMENT_NAME'):
-            self.config['openai']['deployment_name'] = os.getenv('OPENAI_DEPLOYMENT_NAME')
-        
-        # Teams configuration
-        if os.getenv('TEAMS_WEBHOOK_URL'):
-            self.config['teams']['webhook_url'] = os.getenv('TEAMS_WEBHOOK_URL')
-        
-        if os.getenv('TEAMS_CHANNEL_NAME'):
-            self.config['teams']['channel_name'] = os.getenv('TEAMS_CHANNEL_NAME')
-        
-        # Git configuration
-        if os.getenv('GIT_DEFAULT_BRANCH'):
-            self.config['git']['default_branch'] = os.getenv('GIT_DEFAULT_BRANCH')
-        
-        # Monitoring configuration
-        if os.getenv('MONITORING_INTERVAL'):
+    def _load_from_env(self, config: Dict[str, Any]):
+        """Apply environment variable overrides to a configuration dictionary."""
+        env = os.environ
+        for name, (section, key), cast in ENV_OVERRIDES:
+            value = env.get(name)
+            if not value:
+                continue
             try:
-                self.config['monitoring']['interval_seconds'] = int(os.getenv('MONITORING_INTERVAL'))
+                config[section][key] = cast(value)
             except ValueError:
-                pass
-        
-        # Output configuration
-        if os.getenv('LOG_LEVEL'):
-            self.config['output']['log_level'] = os.getenv('LOG_LEVEL')
+                continue
     
     def _validate_config(self):
         """Validate essential configuration parameters."""
         # Check OpenAI API key
-        if not self.config['openai']['api_key']:
+        if not self.OPENAI_API_KEY:
             print("Warning: OpenAI API key not configured. Set OPENAI_API_KEY environment variable or add to config.json")
         
         # Validate model name
-        if not self.config['openai']['model']:
+        if not self.OPENAI_MODEL:
             raise ValueError("OpenAI model not specified")
         
         # Validate monitoring interval
-        if self.config['monitoring']['interval_seconds'] < 60:
+        if self.MONITORING_INTERVAL < 60:
             print("Warning: Monitoring interval is less than 60 seconds. This may cause rate limiting.")
     
     def save_config(self):
         """Save current configuration to file."""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(_json_dumps(self.config))
+            self.refresh()
             print(f"Configuration saved to {self.config_file}")
         except Exception as e:
             print(f"Error saving configuration: {e}")
@@ -163,92 +273,38 @@ class Config:
         }
         
         sample_file = 'config.sample.json'
-        with open(sample_file, 'w', encoding='utf-8') as f:
-            json.dump(sample_config, f, indent=2)
+        with open(sample_file, 'wb') as f:
+            f.write(_json_dumps(sample_config))
         
         print(f"Sample configuration created: {sample_file}")
         print("Copy this to config.json and update with your credentials.")
     
-    # Properties for easy access to configuration values
-    @property
-    def OPENAI_API_KEY(self) -> Optional[str]:
-        return self.config['openai']['api_key']
-    
-    @property
-    def OPENAI_MODEL(self) -> str:
-        return self.config['openai']['model']
-    
-    @property
-    def OPENAI_DEPLOYMENT_NAME(self) -> str:
-        return self.config['openai']['deployment_name']
-    
-    @property
-    def OPENAI_MAX_TOKENS(self) -> int:
-        return self.config['openai']['max_tokens']
-    
-    @property
-    def OPENAI_TEMPERATURE(self) -> float:
-        return self.config['openai']['temperature']
-    
-    @property
-    def OPENAI_TIMEOUT(self) -> int:
-        return self.config['openai']['timeout']
-    
-    @property
-    def TEAMS_WEBHOOK_URL(self) -> Optional[str]:
-        return self.config['teams']['webhook_url']
-    
-    @property
-    def TEAMS_CHANNEL_NAME(self) -> str:
-        return self.config['teams']['channel_name']
-    
-    @property
-    def TEAMS_MENTION_USERS(self) -> list:
-        return self.config['teams']['mention_users']
-    
-    @property
-    def TEAMS_ENABLE_NOTIFICATIONS(self) -> bool:
-        return self.config['teams']['enable_notifications']
-    
-    @property
-    def GIT_DEFAULT_BRANCH(self) -> str:
-        return self.config['git']['default_branch']
-    
-    @property
-    def GIT_IGNORE_PATTERNS(self) -> list:
-        return self.config['git']['ignore_patterns']
-    
-    @property
-    def GIT_FILE_EXTENSIONS(self) -> list:
-        return self.config['git']['file_extensions']
-    
-    @property
-    def MONITORING_INTERVAL(self) -> int:
-        return self.config['monitoring']['interval_seconds']
-    
-    @property
-    def MAX_COMMITS_PER_CHECK(self) -> int:
-        return self.config['monitoring']['max_commits_per_check']
-    
-    @property
-    def ENABLE_CONTINUOUS_MODE(self) -> bool:
-        return self.config['monitoring']['enable_continuous_mode']
-    
-    @property
-    def LOG_LEVEL(self) -> str:
-        return self.config['output']['log_level']
-    
-    @property
-    def LOG_FILE(self) -> str:
-        return self.config['output']['log_file']
-    
-    @property
-    def BACKUP_README(self) -> bool:
-        return self.config['output']['backup_readme']
-    
-    @property
-    def OUTPUT_FORMAT(self) -> str:
-        return self.config['output']['output_format']
+    # Settings for easy access to configuration values; each one is resolved on
+    # first access and then read back as a plain instance attribute
+    OPENAI_API_KEY = _Setting('openai', 'api_key')
+    OPENAI_MODEL = _Setting('openai', 'model')
+    OPENAI_DEPLOYMENT_NAME = _Setting('openai', 'deployment_name')
+    OPENAI_MAX_TOKENS = _Setting('openai', 'max_tokens')
+    OPENAI_TEMPERATURE = _Setting('openai', 'temperature')
+    OPENAI_TIMEOUT = _Setting('openai', 'timeout')
+    
+    TEAMS_WEBHOOK_URL = _Setting('teams', 'webhook_url')
+    TEAMS_CHANNEL_NAME = _Setting('teams', 'channel_name')
+    TEAMS_MENTION_USERS = _Setting('teams', 'mention_users')
+    TEAMS_ENABLE_NOTIFICATIONS = _Setting('teams', 'enable_notifications')
+    
+    GIT_DEFAULT_BRANCH = _Setting('git', 'default_branch')
+    GIT_IGNORE_PATTERNS = _Setting('git', 'ignore_patterns')
+    GIT_FILE_EXTENSIONS = _Setting('git', 'file_extensions')
+    
+    MONITORING_INTERVAL = _Setting('monitoring', 'interval_seconds')
+    MAX_COMMITS_PER_CHECK = _Setting('monitoring', 'max_commits_per_check')
+    ENABLE_CONTINUOUS_MODE = _Setting('monitoring', 'enable_continuous_mode')
+    
+    LOG_LEVEL = _Setting('output', 'log_level')
+    LOG_FILE = _Setting('output', 'log_file')
+    BACKUP_README = _Setting('output', 'backup_readme')
+    OUTPUT_FORMAT = _Setting('output', 'output_format')
     
     def get_openai_config(self) -> Dict[str, Any]:
         """Get OpenAI configuration as a dictionary."""
@@ -2,18 +2,35 @@
 Generate Documentation and Release Notes for Target Directory Only
 This script uses Azure OpenAI to generate project documentation and release notes.
 It processes files within a specified target directory and places documentation in that directory.
-Updated for Azure OpenAI integration - uses api_type='azure' and engine parameter.
+Uses the async Azure OpenAI client so summarization requests run concurrently.
 """
 import os
+import json
+import asyncio
+import hashlib
 import openai
 from dotenv import load_dotenv
+import shutil
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+
+# orjson is optional; fall back to the standard library when it is not installed
+try:
+    import orjson
+    json_loads, json_dumps = orjson.loads, orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
 # Load environment variables
 load_dotenv()
-api_type = os.getenv("OPENAI_API_TYPE")
 api_key = os.getenv("OPENAI_API_KEY")
 api_base = os.getenv("OPENAI_API_BASE")
 api_version = os.getenv("OPENAI_API_VERSION")
@@ -23,79 +40,225 @@ teams_webhook = os.getenv("TEAMS_WEBHOOK_URL")
 # Define the target directory for processing
 target_directory = os.getenv("TARGET_DIRECTORY", "app")
 
-# Configure OpenAI for Azure
-openai.api_type = api_type
-openai.api_key = api_key
-openai.api_base = api_base
-openai.api_version = api_version
+# Summaries are independent network round-trips; cap how many are in flight at once
+MAX_CONCURRENT_SUMMARIES = 8
+# Held by every summary request, batched or per-file, while it is in flight
+summary_slots = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+# Number of files packed into a single summarization request
+SUMMARY_BATCH_SIZE = 8
+# Write buffer for the generated README, which is streamed out section by section
+README_BUFFER_SIZE = 64 * 1024
+# Characters stripped from file names to build table-of-contents anchors
+ANCHOR_TABLE = str.maketrans('', '', './_')
+# Chunk size used when copying the existing changelog below a new entry
+CHANGELOG_COPY_BUFFER_SIZE = 1024 * 1024
+# Largest slice of a commit's patch read from git and passed to the model
+MAX_DIFF_BYTES = 32 * 1024
+# Only the head of each file is sent to the model
+SNIPPET_BYTES = 1500
+# Summaries from previous runs, keyed by a hash of the path and snippet
+SUMMARY_CACHE_FILE = ".doc_cache.json"
+
+@lru_cache(maxsize=None)
+def get_client():
+    """Create the shared Azure OpenAI client on first use, so importing this module needs no credentials."""
+    return openai.AsyncAzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=api_base,
+        max_retries=3,
+    )
 
-def summarize_file(filepath):
+def load_summary_cache():
+    """Load cached summaries from disk, starting empty if the cache is missing or unreadable."""
     try:
-        with open(filepath, 'r', encoding="utf-8", errors="replace") as file:
-            content = file.read(1500)
+        with open(SUMMARY_CACHE_FILE, 'rb') as f:
+            return json_loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_summary_cache():
+    """Atomically write the summary cache back to disk."""
+    tmp_path = SUMMARY_CACHE_FILE + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json_dumps(summary_cache))
+    os.replace(tmp_path, SUMMARY_CACHE_FILE)
+
+summary_cache = load_summary_cache()
+
+def summary_cache_key(filepath, content):
+    return hashlib.blake2b(f"{filepath}\0{content}".encode('utf-8'), digest_size=16).hexdigest()
+
+def read_snippet(filepath):
+    """
+    Read the first SNIPPET_BYTES of a file as text.
+    
+    Returns a (content, canned_summary) pair. Empty and binary files get a canned
+    summary instead of content, since the model cannot say anything useful about them.
+    """
+    size = os.stat(filepath).st_size
+    if size == 0:
+        return "", "(empty file)"
+    with open(filepath, 'rb') as file:
+        raw = file.read(SNIPPET_BYTES)
+    if b'\x00' in raw[:512]:
+        return "", f"(binary file, {size} bytes)"
+    return raw.decode('utf-8', errors='replace'), None
+
+async def summarize_file(filepath):
+    try:
+        content, canned_summary = read_snippet(filepath)
+        if canned_summary:
+            return canned_summary
+        key = summary_cache_key(filepath, content)
+        if key in summary_cache:
+            return summary_cache[key]
         prompt = (
             f"I have a project file at '{filepath}'. Here is a snippet of its content:\n"
             f"-----\n{content}\n-----\n"
             "Explain in simple, beginner-friendly language what this file is for, what it does, and how it fits in the project."
         )
-        response = openai.ChatCompletion.create(
-            engine=deployment,
-            messages=[
-                {"role": "system", "content": "You are a helpful project documentation tool."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        async with summary_slots:
+            response = await get_client().chat.completions.create(
+                model=deployment,
+                messages=[
+                    {"role": "system", "content": "You are a helpful project documentation tool."},
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        summary = response.choices[0].message.content.strip()
+        summary_cache[key] = summary
+        return summary
     except Exception as e:
         return f"Could not summarize {filepath}: {str(e)}"
 
+async def summarize_files_batch(paths):
+    """Summarize several files with one request; returns a dict mapping filepath -> summary."""
+    results = {}
+    try:
+        pending = {}
+        for filepath in paths:
+            content, canned_summary = read_snippet(filepath)
+            if canned_summary:
+                results[filepath] = canned_summary
+                continue
+            key = summary_cache_key(filepath, content)
+            if key in summary_cache:
+                results[filepath] = summary_cache[key]
+            else:
+                pending[filepath] = (key, content)
+        if pending:
+            prompt = (
+                "I have several project files. Here is a snippet of the content of each one:\n\n"
+                + "".join(f"=== FILE: {fp} ===\n{content}\n" for fp, (_, content) in pending.items())
+                + "\nFor each file, explain in simple, beginner-friendly language what it is for, what it does, and how it fits in the project.\n"
+                "Return a JSON object mapping filepath -> summary, using the exact filepaths given above."
+            )
+            async with summary_slots:
+                response = await get_client().chat.completions.create(
+                    model=deployment,
+                    messages=[
+                        {"role": "system", "content": "You are a helpful project documentation tool."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    # Forces a bare JSON object; a fenced ```json reply would fail to parse
+                    response_format={"type": "json_object"}
+                )
+            summaries = json.loads(response.choices[0].message.content)
+            if not isinstance(summaries, dict):
+                raise ValueError("expected a JSON object")
+            for fp, (key, _) in pending.items():
+                if isinstance(summaries.get(fp), str):
+                    results[fp] = summary_cache[key] = summaries[fp].strip()
+    except Exception as e:
+        print(f"Batch summarization failed ({e}); falling back to per-file requests.")
+    # Anything the model dropped or failed on is summarized individually
+    missing = [fp for fp in paths if fp not in results]
+    for fp, summary in zip(missing, await asyncio.gather(*(summarize_file(fp) for fp in missing))):
+        results[fp] = summary
+    return results
+
+SKIPPED_DIRS = frozenset({".git", "__pycache__", "env", "venv", ".idea", ".vscode", ".pytest_cache"})
+# .env, .env.local, .env.production, ... hold secrets; they must never reach the model or the README
+SECRET_FILE_PREFIX = ".env"
+
+def iter_files(root, skip=SKIPPED_DIRS):
+    """Recursively yield file paths under root, pruning skipped directories by name."""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        # The target tree may contain directories we cannot list; document what we can
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in skip:
+                yield from iter_files(entry.path, skip)
+        elif entry.is_file(follow_symlinks=False):
+            if not entry.name.endswith('.pyc') and not entry.name.startswith(SECRET_FILE_PREFIX):
+                yield entry.path
+
 def list_files_in_target_directory():
     """Only list files within the target directory."""
     if not os.path.exists(target_directory):
         print(f"Warning: '{target_directory}' directory does not exist.")
         return []
     
-    skipped = {".git", "__pycache__", "env", "venv", ".idea", ".vscode", ".pytest_cache"}
-    files = []
-    for root, dirs, filenames in os.walk(target_directory):
-        dirs[:] = [d for d in dirs if d not in skipped]
-        for name in filenames:
-            path = os.path.join(root, name)
-            if not any(skip in path for skip in skipped) and not path.endswith('.pyc'):
-                files.append(path)
-    return files
-
-def get_target_commit_info():
-    """Get commit information for files in the target directory only."""
-    try:
-        result = subprocess.check_output(
-            ['git', 'log', '-1', '--pretty=%B', '--', f'{target_directory}/']
-        ).decode().strip()
-        if result:
-            return result
-        else:
-            return f"No commits found for {target_directory} directory"
-    except subprocess.CalledProcessError:
-        return f"Unable to retrieve commit information for {target_directory} directory"
+    return list(iter_files(target_directory))
 
-def get_target_commit_diff():
-    """Get diff for the latest commit that affected the target directory."""
-    try:
-        commit_hash = subprocess.check_output(
-            ['git', 'log', '-1', '--pretty=%H', '--', f'{target_directory}/']
-        ).decode().strip()
-        
-        if commit_hash:
-            result = subprocess.check_output(
-                ['git', 'show', '--pretty=medium', '--stat', '--patch', commit_hash, '--', f'{target_directory}/']
-            ).decode(errors='replace')
-            return result
-        else:
-            return f"No diffs found for {target_directory} directory"
-    except subprocess.CalledProcessError:
-        return f"Unable to retrieve diff information for {target_directory} directory"
+@dataclass
+class CommitBundle:
+    """Hash, message and diff of the latest commit that affected the target directory."""
+    hash: str
+    message: str
+    diff: str
 
-def generate_release_note(commit_message, commit_diff):
+def get_target_commit_bundle():
+    """Get the latest target-directory commit's message and diff with a single git call.
+    
+    The diff is read straight from git's output pipe and capped at MAX_DIFF_BYTES,
+    so a large commit is never buffered in full.
+    """
+    with subprocess.Popen(
+        ['git', 'log', '-1',
+         '--pretty=format:===HASH===%H%n===MSG===%n%B%n===DIFF===%ncommit %H%nAuthor: %an <%ae>%nDate:   %ad%n',
+         '--stat', '--patch', '--', f'{target_directory}/'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as proc:
+        header_lines = []
+        for line in proc.stdout:
+            if line == b"===DIFF===\n":
+                break
+            header_lines.append(line)
+        diff = proc.stdout.read(MAX_DIFF_BYTES)
+        truncated = bool(proc.stdout.read(1))
+        if truncated:
+            proc.kill()  # The rest of the patch is not needed
+        returncode = proc.wait()
+    
+    if returncode != 0 and not truncated:
+        return CommitBundle(
+            hash="",
+            message=f"Unable to retrieve commit information for {target_directory} directory",
+            diff=f"Unable to retrieve diff information for {target_directory} directory",
+        )
+    if not header_lines:
+        return CommitBundle(
+            hash="",
+            message=f"No commits found for {target_directory} directory",
+            diff=f"No diffs found for {target_directory} directory",
+        )
+
+    commit_hash, _, message = b"".join(header_lines).removeprefix(b"===HASH===").partition(b"\n===MSG===\n")
+    diff_text = diff.decode(errors='replace')
+    if truncated:
+        diff_text += f"\n(diff truncated to {MAX_DIFF_BYTES // 1024} KB)\n"
+    return CommitBundle(
+        hash=commit_hash.decode().strip(),
+        message=message.decode(errors='replace').strip(),
+        diff=diff_text,
+    )
+
+async def generate_release_note(commit_message, commit_diff):
     if not commit_diff.strip():
         return "No meaningful changes detected."
 
@@ -119,8 +282,8 @@ def generate_release_note(commit_message, commit_diff):
             "- Provide a summary that can be directly used in a changelog or release note.\n\n"
             "Ensure the output is structured, concise, and developer-friendly."
         )
-        response = openai.ChatCompletion.create(
-            engine=deployment,
+        response = await get_client().chat.completions.create(
+            model=deployment,
             messages=[
                 {"role": "system", "content": "You are a release note generator focusing on target directory changes."},
                 {"role": "user", "content": prompt}
@@ -134,11 +297,32 @@ def generate_release_note(commit_message, commit_diff):
     except Exception as e:
         return f"Release note generation failed: {str(e)}"
 
+def create_teams_session():
+    """Create a keep-alive session for webhook posts that retries throttled and failed requests."""
+    retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+# Reused across notifications so the TLS connection to the webhook stays open
+teams_session = create_teams_session()
+
 def send_to_teams(message):
     if not teams_webhook:
         print("TEAMS_WEBHOOK_URL not configured.")
         return
-    resp = requests.post(teams_webhook, json={"text": message})
+    try:
+        resp = teams_session.post(teams_webhook, json={"text": message}, timeout=10)
+    except requests.RequestException as e:
+        print(f"Failed to send to Teams: {e}")
+        return
     if resp.status_code == 200:
         print("Release note sent to Teams.")
     else:
@@ -170,30 +354,32 @@ def update_target_changelog(commit_message, commit_diff, release_note):
 ---
 """
     
-    if os.path.exists(changelog_path):
-        # Read existing changelog
-        with open(changelog_path, 'r', encoding='utf-8') as f:
-            existing_content = f.read()
-        
-        # Add new entry at the top (after title if it exists)
-        if existing_content.startswith("# Changelog"):
-            lines = existing_content.split('\n', 2)
-            if len(lines) >= 2:
-                updated_content = lines[0] + '\n' + lines[1] + new_entry + '\n'.join(lines[2:])
-            else:
-                updated_content = existing_content + new_entry
-        else:
-            updated_content = f"# {target_directory.capitalize()} Directory Changelog\n\nThis changelog documents changes made to files in the '{target_directory}' directory only.\n" + new_entry + existing_content
-    else:
-        # Create new changelog
-        updated_content = f"# {target_directory.capitalize()} Directory Changelog\n\nThis changelog documents changes made to files in the '{target_directory}' directory only.\n" + new_entry
+    header = f"# {target_directory.capitalize()} Directory Changelog\n\nThis changelog documents changes made to files in the '{target_directory}' directory only.\n"
+    entry = new_entry.encode('utf-8')
     
-    with open(changelog_path, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    # Write the new entry into a temp file, stream the existing changelog after it,
+    # then swap it into place so the old content is never loaded into memory at once
+    tmp_path = changelog_path + ".tmp"
+    with open(tmp_path, 'wb') as out:
+        if os.path.exists(changelog_path):
+            with open(changelog_path, 'rb') as existing:
+                # Add new entry at the top (after title if it exists)
+                first_line = existing.readline()
+                if first_line.startswith(b"# Changelog"):
+                    second_line = existing.readline()
+                    out.write(first_line + second_line.removesuffix(b"\n") + entry)
+                else:
+                    existing.seek(0)
+                    out.write(header.encode('utf-8') + entry)
+                shutil.copyfileobj(existing, out, CHANGELOG_COPY_BUFFER_SIZE)
+        else:
+            # Create new changelog
+            out.write(header.encode('utf-8') + entry)
+    os.replace(tmp_path, changelog_path)
     
     print(f"Updated {changelog_path} with latest changes.")
 
-def main():
+async def main():
     print(f"Starting {target_directory} directory documentation and release generation...")
     
     # Ensure target directory exists
@@ -203,34 +389,59 @@ def main():
     
     # README Generation for target directory only
     target_files = list_files_in_target_directory()
-    doc_sections = []
-    
+    files = []
+    toc_lines = []
     for fp in target_files:
         if fp.endswith(('.md', '.txt')):
             continue  # Skip documentation files
-        section = f"### {fp}\n\n{summarize_file(fp)}\n"
-        doc_sections.append(section)
-    
-    target_readme = (
-        f"# {target_directory.capitalize()} Directory Documentation (Auto-Generated)\n\n"
-        f"This README is auto-generated and explains every file in the '{target_directory}' directory in simple language, so anyone can quickly understand the purpose of each file.\n\n"
-        "## Table of Contents\n" +
-        "".join([f"- [{os.path.basename(fp)}](#{os.path.basename(fp).replace('.', '').replace('/', '').replace('_', '').lower()})\n"
-                 for fp in target_files if fp and not fp.endswith(('.md', '.txt'))]) +
-        "\n---\n\n"
-        + "\n---\n".join(doc_sections)
-        + "\n\n*To re-generate this README, run the documentation script.*\n"
-        + f"\n*This documentation focuses only on files within the '{target_directory}' directory.*"
-    )
+        name = os.path.basename(fp)
+        files.append(fp)
+        toc_lines.append(f"- [{name}](#{name.translate(ANCHOR_TABLE).lower()})\n")
     
     target_readme_path = os.path.join(target_directory, "README.md")
-    with open(target_readme_path, "w", encoding="utf-8") as f:
-        f.write(target_readme)
+    # Sections stream into a sibling temp file that replaces the README only once
+    # every summary is written, so an interrupted run leaves the old README intact
+    tmp_readme_path = target_readme_path + ".tmp"
+    try:
+        with open(tmp_readme_path, "w", encoding="utf-8", buffering=README_BUFFER_SIZE) as f:
+            f.write(
+                f"# {target_directory.capitalize()} Directory Documentation (Auto-Generated)\n\n"
+                f"This README is auto-generated and explains every file in the '{target_directory}' directory in simple language, so anyone can quickly understand the purpose of each file.\n\n"
+                "## Table of Contents\n"
+            )
+            f.writelines(toc_lines)
+            f.write("\n---\n\n")
+            
+            if files:
+                # Every request, including per-file fallbacks inside a batch,
+                # waits for one of the summary_slots
+                batches = [files[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(files), SUMMARY_BATCH_SIZE)]
+                tasks = [asyncio.create_task(summarize_files_batch(batch)) for batch in batches]
+                # Awaiting in submission order lets finished sections stream to disk
+                # while later batches are still in flight
+                separator = ""
+                for batch, task in zip(batches, tasks):
+                    batch_summaries = await task
+                    for fp in batch:
+                        f.write(f"{separator}### {fp}\n\n{batch_summaries[fp]}\n")
+                        separator = "\n---\n"
+            
+            f.write(
+                "\n\n*To re-generate this README, run the documentation script.*\n"
+                f"\n*This documentation focuses only on files within the '{target_directory}' directory.*"
+            )
+        os.replace(tmp_readme_path, target_readme_path)
+    except BaseException:
+        if os.path.exists(tmp_readme_path):
+            os.remove(tmp_readme_path)
+        raise
     print(f"{target_readme_path} updated with explanations for all {target_directory} directory files.")
+    save_summary_cache()
     
     # Release Note Generation & Teams Notification (target directory only)
-    commit_message = get_target_commit_info()
-    commit_diff = get_target_commit_diff()
+    commit = get_target_commit_bundle()
+    commit_message = commit.message
+    commit_diff = commit.diff
 
     # Skip release note generation if nothing meaningful
     if not commit_message or "No commits found" in commit_message:
@@ -241,7 +452,7 @@ def main():
         print("No meaningful changes in commit diff. Skipping release note generation.")
         return
 
-    release_note = generate_release_note(commit_message, commit_diff)
+    release_note = await generate_release_note(commit_message, commit_diff)
     
     if not release_note or release_note.strip() == "No meaningful changes detected.":
         print("No meaningful changes detected. Skipping changelog update and Teams notification.")
@@ -263,4 +474,4 @@ def main():
     print(f"\n🎯 This script now operates only on the '{target_directory}' directory as requested.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -16,7 +16,7 @@ PREREQUISITES:
       * OPENAI_API_BASE  
       * OPENAI_API_VERSION
       * OPENAI_DEPLOYMENT_NAME
-    - Required packages: openai, python-dotenv
+    - Required packages: openai, httpx[http2], python-dotenv
     
 OUTPUT:
     - Updates root README.md with summaries of all files except those in app/
@@ -24,7 +24,17 @@ OUTPUT:
 """
 
 import os
+import json
+import asyncio
+import hashlib
+import random
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache, wraps
+import httpx
 import openai
+from openai import AsyncAzureOpenAI
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -37,44 +47,492 @@ api_base = os.getenv("OPENAI_API_BASE")
 api_version = os.getenv("OPENAI_API_VERSION")
 deployment = os.getenv("OPENAI_DEPLOYMENT_NAME")
 
-# Configure OpenAI for Azure
-openai.api_type = 'azure'
-openai.api_key = api_key
-openai.api_base = api_base
-openai.api_version = api_version
+# Use the Batch API once there are enough files for its cost savings to outweigh its latency
+BATCH_API_MIN_FILES = 50
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+# Longest a README run waits on a batch before cancelling it and summarizing directly
+BATCH_MAX_WAIT_SECONDS = 30 * 60
 
-def summarize_file(filepath):
+# Generation settings for summaries; short, focused answers come back faster
+SUMMARY_MAX_TOKENS = 250
+SUMMARY_OPTIONS = {"max_tokens": SUMMARY_MAX_TOKENS, "temperature": 0.2, "top_p": 0.9}
+
+# Files packed into one prompt when summarizing several at once, bounded by count and total snippet size
+BATCH_PROMPT_MAX_FILES = 16
+BATCH_PROMPT_MAX_CHARS = 8 * 1024
+
+# Characters of each file sent to the model; the top of a file is enough to explain it
+SNIPPET_CHARS = 800
+
+# Files the model cannot usefully summarize are described without an API call
+SKIPPED_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".webp", ".bmp",
+    ".pdf", ".zip", ".gz", ".tar", ".whl", ".bin", ".exe", ".dll", ".so", ".pyc",
+    ".lock", ".min.js", ".min.css", ".map", ".woff", ".woff2", ".ttf",
+)
+# Generated lockfiles whose extension alone does not give them away
+SKIPPED_FILENAMES = frozenset({
+    "package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml", "yarn.lock",
+    "poetry.lock", "Pipfile.lock", "Cargo.lock", "composer.lock", "Gemfile.lock", "go.sum",
+})
+MAX_SUMMARY_BYTES = 200_000
+
+# Constant instructions go first and the short per-file snippet last
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful project documentation tool."}
+PROMPT_PREFIX = (
+    "Explain in simple, beginner-friendly language what this project file is for, "
+    "what it does, and how it fits in the project.\n"
+)
+
+# Per-file requests run concurrently, but never more than this many at once
+MAX_CONCURRENT_REQUESTS = 10
+MAX_ATTEMPTS = 3
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+# Keep enough pooled connections for every request slot plus batch uploads and polling
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+
+# Summaries from previous runs, keyed by a hash of each file's path and snippet
+SUMMARY_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".summary_cache.json")
+
+def load_summary_cache():
+    """
+    Load cached summaries from previous runs.
+    
+    Returns:
+        dict: Summaries keyed by content hash, or an empty dict if there is no usable cache
+    """
+    try:
+        with open(SUMMARY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_summary_cache():
+    """
+    Atomically write the summary cache back to disk.
+    """
+    tmp_path = SUMMARY_CACHE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary_cache, f)
+    os.replace(tmp_path, SUMMARY_CACHE_FILE)
+
+summary_cache = load_summary_cache()
+
+@lru_cache(maxsize=None)
+def get_client():
+    """
+    Create the shared Azure OpenAI client on first use.
+    
+    Returns:
+        AsyncAzureOpenAI: Client reused by every summarization request
+    """
+    # Retries are handled by with_retries so they back off outside the request slots.
+    # One pooled HTTP/2 client lets concurrent requests share a TLS connection.
+    return AsyncAzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=api_base,
+        max_retries=0,
+        http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS),
+    )
+
+def with_retries(func):
+    """
+    Retry an Azure OpenAI request with exponential backoff on throttling and transient errors.
+    
+    Each attempt holds one of the MAX_CONCURRENT_REQUESTS request slots, so concurrency
+    stays bounded no matter how many tasks await the wrapped coroutine.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                async with request_slots:
+                    return await func(*args, **kwargs)
+            except RETRYABLE_ERRORS:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())
+    return wrapper
+
+def read_snippet(filepath):
+    """
+    Read the part of a file that is sent to the model.
+    
+    Args:
+        filepath (str): Path to the file
+        
+    Returns:
+        str: The first SNIPPET_CHARS characters of the file
+    """
+    with open(filepath, 'r', encoding="utf-8", errors="replace") as file:
+        return file.read(SNIPPET_CHARS)
+
+def describe_unsummarizable(filepath):
+    """
+    Describe a file that should not be sent to the model.
+    
+    Args:
+        filepath (str): Path to the file
+        
+    Returns:
+        str: A short description for binary, oversized or non-source files, or None if the file should be summarized
+    """
+    if filepath.lower().endswith(SKIPPED_EXTENSIONS):
+        return f"Binary/non-source file: {filepath}"
+    if os.path.basename(filepath) in SKIPPED_FILENAMES:
+        return f"Generated lockfile: {filepath}"
+    size = os.path.getsize(filepath)
+    if size > MAX_SUMMARY_BYTES:
+        return f"Large file ({size // 1024} KB), not summarized: {filepath}"
+    with open(filepath, 'rb') as file:
+        if b"\0" in file.read(4096):
+            return f"Binary/non-source file: {filepath}"
+    return None
+
+def summary_cache_key(filepath, content):
+    """
+    Hash a file's path and snippet into a summary cache key.
+    
+    Args:
+        filepath (str): Path to the file
+        content (str): Snippet sent to the model
+        
+    Returns:
+        str: Hex digest identifying this version of the file
+    """
+    return hashlib.sha256(f"{filepath}\0{content}".encode('utf-8')).hexdigest()
+
+def build_summary_messages(filepath, content):
+    """
+    Build the chat messages that ask for a summary of a file.
+    
+    Args:
+        filepath (str): Path to the file to summarize
+        content (str): Snippet of the file's content
+        
+    Returns:
+        list: System and user messages for the chat completion request
+    """
+    return [
+        SYSTEM_MESSAGE,
+        {"role": "user", "content": f"{PROMPT_PREFIX}File: {filepath}\n-----\n{content}\n-----"}
+    ]
+
+@with_retries
+async def create_completion(messages, **options):
+    """
+    Send a chat completion request to the configured Azure OpenAI deployment.
+    
+    Args:
+        messages (list): Chat messages to send
+        **options: Extra request parameters such as max_tokens or response_format
+        
+    Returns:
+        ChatCompletion: The API response
+    """
+    return await get_client().chat.completions.create(model=deployment, messages=messages, **options)
+
+@with_retries
+async def stream_completion(messages, **options):
+    """
+    Stream a chat completion and collect its text.
+    
+    The whole stream is read inside with_retries, so the response holds its request
+    slot until it has been fully received and errors mid-stream are retried.
+    
+    Args:
+        messages (list): Chat messages to send
+        **options: Extra request parameters such as max_tokens
+        
+    Returns:
+        str: The generated text
+    """
+    response = await get_client().chat.completions.create(
+        model=deployment, messages=messages, stream=True, **options
+    )
+    parts = []
+    async for chunk in response:
+        if chunk.choices:  # Azure sends content-filter chunks with no choices
+            parts.append(chunk.choices[0].delta.content or "")
+    return "".join(parts)
+
+async def summarize_file(filepath, content=None):
     """
     Generate a beginner-friendly summary of a file using Azure OpenAI.
     
     Args:
         filepath (str): Path to the file to summarize
+        content (str): Snippet of the file, if it has already been read
         
     Returns:
         str: AI-generated summary of the file
     """
     try:
-        with open(filepath, 'r', encoding="utf-8", errors="replace") as file:
-            content = file.read(1500)  # Read first 1500 characters
-            
+        if content is None:
+            description = describe_unsummarizable(filepath)
+            if description:
+                return description
+            content = read_snippet(filepath)
+        key = summary_cache_key(filepath, content)
+        if key in summary_cache:
+            return summary_cache[key]
+        
+        summary = (await stream_completion(build_summary_messages(filepath, content), **SUMMARY_OPTIONS)).strip()
+        summary_cache[key] = summary
+        return summary
+        
+    except Exception as e:
+        return f"Could not summarize {filepath}: {str(e)}"
+
+def build_batch_jsonl(snippets):
+    """
+    Build one Batch API request per file, keyed by its path.
+    
+    Args:
+        snippets (dict): File snippets keyed by file path
+        
+    Yields:
+        dict: Request line for the batch input file
+    """
+    for fp, content in snippets.items():
+        yield {
+            "custom_id": fp,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {"model": deployment, "messages": build_summary_messages(fp, content), **SUMMARY_OPTIONS}
+        }
+
+async def summarize_files_with_batch_api(snippets):
+    """
+    Summarize files with a single Azure OpenAI Batch API job.
+    
+    Args:
+        snippets (dict): File snippets keyed by file path
+        
+    Returns:
+        dict: Summaries keyed by file path; files whose request failed are omitted
+    """
+    client = get_client()
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False) as tmp:
+        for request in build_batch_jsonl(snippets):
+            tmp.write(json.dumps(request) + "\n")
+    try:
+        with open(tmp.name, 'rb') as f:
+            input_file = await client.files.create(file=f, purpose="batch")
+    finally:
+        os.remove(tmp.name)
+    
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} for {len(snippets)} files, waiting for it to complete...")
+    
+    delay = 5
+    deadline = time.monotonic() + BATCH_MAX_WAIT_SECONDS
+    while batch.status not in BATCH_TERMINAL_STATES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"Batch {batch.id} still '{batch.status}' after {BATCH_MAX_WAIT_SECONDS // 60} minutes; cancelling it.")
+            await client.batches.cancel(batch.id)
+            return {}
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 300)
+        batch = await client.batches.retrieve(batch.id)
+        print(f"Batch {batch.id}: {batch.status}")
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Batch {batch.id} finished with status '{batch.status}'.")
+        return {}
+    
+    summaries = {}
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        fp = result["custom_id"]
+        if response.get("status_code") == 200 and fp in snippets:
+            summary = response["body"]["choices"][0]["message"]["content"].strip()
+            summaries[fp] = summary_cache[summary_cache_key(fp, snippets[fp])] = summary
+    return summaries
+
+def group_snippets(snippets):
+    """
+    Split snippets into groups small enough to summarize with one request.
+    
+    Args:
+        snippets (dict): File snippets keyed by file path
+        
+    Yields:
+        dict: At most BATCH_PROMPT_MAX_FILES snippets totalling about BATCH_PROMPT_MAX_CHARS characters
+    """
+    group, size = {}, 0
+    for fp, content in snippets.items():
+        if group and (len(group) == BATCH_PROMPT_MAX_FILES or size + len(content) > BATCH_PROMPT_MAX_CHARS):
+            yield group
+            group, size = {}, 0
+        group[fp] = content
+        size += len(content)
+    if group:
+        yield group
+
+async def summarize_batch(snippets):
+    """
+    Summarize several files with one request that returns a JSON object.
+    
+    Args:
+        snippets (dict): File snippets keyed by file path
+        
+    Returns:
+        dict: Summaries keyed by file path; files the model skipped are omitted
+    """
+    try:
         prompt = (
-            f"I have a project file at '{filepath}'. Here is a snippet of its content:\n"
-            f"-----\n{content}\n-----\n"
-            "Explain in simple, beginner-friendly language what this file is for, what it does, and how it fits in the project."
+            "For each of the following files, produce a one-paragraph beginner-friendly summary "
+            "of what it is for, what it does, and how it fits in the project. "
+            "Return a JSON object mapping each file path, exactly as given, to its summary.\n\n"
+            + "".join(f"### FILE: {fp}\n{content}\n" for fp, content in snippets.items())
         )
-        
-        response = openai.ChatCompletion.create(
-            engine=deployment,
-            messages=[
-                {"role": "system", "content": "You are a helpful project documentation tool."},
-                {"role": "user", "content": prompt}
-            ]
+        response = await create_completion(
+            [SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            **{**SUMMARY_OPTIONS, "max_tokens": SUMMARY_MAX_TOKENS * len(snippets)}
         )
+        results = json.loads(response.choices[0].message.content)
+        if not isinstance(results, dict):
+            raise ValueError("expected a JSON object")
+    except Exception as e:
+        print(f"Batched summary of {len(snippets)} files failed ({e}); falling back to per-file requests.")
+        return {}
+    
+    summaries = {}
+    for fp, content in snippets.items():
+        if isinstance(results.get(fp), str):
+            summaries[fp] = summary_cache[summary_cache_key(fp, content)] = results[fp].strip()
+    return summaries
+
+async def summarize_files(files):
+    """
+    Summarize files, using the Batch API for large sets and packed prompts otherwise.
+    
+    Args:
+        files (list): List of file paths to summarize
         
-        return response.choices[0].message.content.strip()
+    Returns:
+        dict: Summaries keyed by file path
+    """
+    summaries = {}
+    snippets = {}
+    cached = 0
+    for fp in files:
+        try:
+            description = describe_unsummarizable(fp)
+            if description:
+                summaries[fp] = description
+                continue
+            content = read_snippet(fp)
+        except OSError:
+            continue  # Left to summarize_file, which reports the error
+        key = summary_cache_key(fp, content)
+        if key in summary_cache:
+            summaries[fp] = summary_cache[key]
+            cached += 1
+        else:
+            snippets[fp] = content
+    if cached:
+        print(f"Reusing cached summaries for {cached} unchanged files.")
+    
+    if len(snippets) >= BATCH_API_MIN_FILES:
+        try:
+            summaries.update(await summarize_files_with_batch_api(snippets))
+        except Exception as e:
+            print(f"Batch API unavailable ({e}); falling back to per-file requests.")
+    
+    pending = {fp: content for fp, content in snippets.items() if fp not in summaries}
+    if pending:
+        groups = list(group_snippets(pending))
+        print(f"Summarizing {len(pending)} files in {len(groups)} packed requests...")
+        for batch in await asyncio.gather(*(summarize_batch(group) for group in groups)):
+            summaries.update(batch)
+    
+    # Anything unreadable, dropped by the model, or in a failed request is summarized on its own
+    remaining = [fp for fp in files if fp not in summaries]
+    if remaining:
+        print(f"Summarizing {len(remaining)} files with up to {MAX_CONCURRENT_REQUESTS} concurrent requests...")
+        results = await asyncio.gather(*(summarize_file(fp, snippets.get(fp)) for fp in remaining))
+        for fp, summary in zip(remaining, results):
+            print(f"Summarized: {fp}")
+            summaries[fp] = summary
+    return summaries
+
+SKIPPED_DIRS = frozenset({".git", "__pycache__", "env", "venv", ".idea", ".vscode", ".pytest_cache", "app"})
+# Includes the summary caches written at the repository root by this script,
+# generate_docs_and_release.py and update_readme.py
+SKIPPED_FILES = frozenset({".DS_Store", ".summary_cache.json", ".doc_cache.json", ".readme_cache.json"})
+# Any .env variant (.env.local, .env.production, ...) carries credentials, so it is
+# matched by prefix rather than listed
+SECRET_FILE_PREFIX = ".env"
+
+# Walking the whole repository is dominated by waiting on the filesystem, so oversubscribe the CPUs
+WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def scan_directory(directory, prefix):
+    """
+    List one directory for threaded_walk.
+    
+    Args:
+        directory (str): Directory to scan
+        prefix (str): Normalized path of the directory relative to the repository, ending in '/'
         
-    except Exception as e:
-        return f"Could not summarize {filepath}: {str(e)}"
+    Returns:
+        tuple: (file paths, [(subdirectory, prefix), ...]) with skipped entries removed
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Like os.walk, symlinked directories are neither listed nor followed
+                    if entry.name not in SKIPPED_DIRS and not entry.is_symlink():
+                        subdirs.append((entry.path, f"{prefix}{entry.name}/"))
+                elif (entry.name not in SKIPPED_FILES and not entry.name.endswith('.pyc')
+                      and not entry.name.startswith(SECRET_FILE_PREFIX)):
+                    files.append(prefix + entry.name)
+    except OSError:
+        # A repository directory we lack permission for, or that vanished mid-walk,
+        # is treated as empty, matching what os.walk used to do
+        pass
+    return files, subdirs
+
+def threaded_walk(root="."):
+    """
+    Walk the repository with a thread pool, scanning each directory as a separate task.
+    
+    Args:
+        root (str): Directory to start from
+        
+    Yields:
+        str: File path relative to the repository, using '/' separators
+    """
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        pending = {executor.submit(scan_directory, root, "")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                yield from files
+                pending.update(executor.submit(scan_directory, path, prefix) for path, prefix in subdirs)
 
 def list_all_files_except_app():
     """
@@ -83,29 +541,7 @@ def list_all_files_except_app():
     Returns:
         list: List of file paths excluding app directory and common ignore patterns
     """
-    skipped_dirs = {".git", "__pycache__", "env", "venv", ".idea", ".vscode", ".pytest_cache", "app"}
-    skipped_files = {".env", ".DS_Store"}
-    files = []
-    
-    for root, dirs, filenames in os.walk("."):
-        # Remove skipped directories from the walk
-        dirs[:] = [d for d in dirs if d not in skipped_dirs]
-        
-        for name in filenames:
-            if name in skipped_files or name.endswith('.pyc'):
-                continue
-                
-            path = os.path.join(root, name)
-            # Normalize path and remove leading './'
-            path = path.replace("\\", "/")
-            if path.startswith("./"):
-                path = path[2:]
-            
-            # Skip if path contains any skipped directory
-            if not any(skip in path for skip in skipped_dirs):
-                files.append(path)
-    
-    return sorted(files)
+    return sorted(threaded_walk())
 
 def generate_table_of_contents(files):
     """
@@ -126,7 +562,7 @@ def generate_table_of_contents(files):
     
     return "\n".join(toc_lines)
 
-def update_root_readme(files):
+async def update_root_readme(files):
     """
     Update the root README.md with summaries of all non-app files.
     
@@ -142,16 +578,14 @@ def update_root_readme(files):
         if fp.endswith(('.md', '.txt')):
             print(f"Skipping documentation file: {fp}")
             continue
-            
-        print(f"Summarizing: {fp}")
-        summary = summarize_file(fp)
-        
-        # Create anchor-friendly heading
-        anchor = fp.replace('.', '').replace('/', '').replace('_', '').replace('-', '').lower()
-        section = f"### {fp}\n\n{summary}\n"
-        doc_sections.append(section)
         processed_files.append(fp)
     
+    summaries = await summarize_files(processed_files)
+    
+    for fp in processed_files:
+        section = f"### {fp}\n\n{summaries[fp]}\n"
+        doc_sections.append(section)
+    
     # Generate table of contents
     toc = generate_table_of_contents(processed_files)
     
@@ -186,13 +620,16 @@ python genrate_for_this_repo.py
     
     # Write to root README.md
     readme_path = "README.md"
-    with open(readme_path, "w", encoding="utf-8") as f:
+    tmp_path = readme_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         f.write(readme_content)
+    os.replace(tmp_path, readme_path)
+    save_summary_cache()
     
     print(f"\n✅ Updated {readme_path} with documentation for {len(processed_files)} files.")
     print(f"📁 Documented files: {', '.join(processed_files)}")
 
-def main():
+async def main():
     """
     Main function to execute the documentation generation process.
     """
@@ -220,11 +657,11 @@ def main():
         print(f"   ... and {len(all_files) - 10} more files")
     
     # Update README.md with summaries
-    update_root_readme(all_files)
+    await update_root_readme(all_files)
     
     print("\n🎯 Repository documentation generation completed successfully!")
     print("📖 The root README.md now contains summaries of all non-app files.")
     print("\n💡 To include app directory files in documentation, use the existing generate_docs_and_release.py script.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
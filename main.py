@@ -32,6 +32,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Commit message keywords that mark a change worth reflecting in the README
+README_UPDATE_KEYWORDS = (
+    'feature', 'add', 'new', 'version', 'release',
+    'update', 'improve', 'enhance', 'docs', 'readme'
+)
+
 class ReleaseNotesAutomator:
     """Main class for automating release notes generation and distribution."""
     
@@ -42,11 +48,14 @@ class ReleaseNotesAutomator:
         # Load configuration
         self.config = Config()
         
-        # Initialize components
+        # Initialize components once; they are reused for every commit
         self.git_monitor = GitMonitor(self.config)
         self.llm_handler = LLMHandler(self.config)
         self.teams_integration = TeamsIntegration(self.config)
         
+        # Frozen snapshot for settings read on every commit or polling cycle
+        self.settings = self.config.snap
+        
         # Track last processed commit
         self.last_commit_hash = self._get_last_processed_commit()
         
@@ -65,6 +74,12 @@ class ReleaseNotesAutomator:
         with open('.last_commit', 'w') as f:
             f.write(commit_hash)
     
+    def _get_changes_for_commits(self, commits):
+        """Extract the changes of several commits, in commit order."""
+        # Serial on purpose: GitMonitor has not been audited for thread safety
+        # (a shared GitPython Repo, for one, is not safe across threads)
+        return [self.git_monitor.get_commit_changes(commit['hash']) for commit in commits]
+    
     def run_continuous_monitoring(self):
         """Run continuous monitoring of git commits."""
         logger.info("Starting continuous monitoring mode")
@@ -72,7 +87,7 @@ class ReleaseNotesAutomator:
         while True:
             try:
                 self.process_new_commits()
-                time.sleep(self.config.MONITORING_INTERVAL)
+                time.sleep(self.settings.monitoring_interval)
             except KeyboardInterrupt:
                 logger.info("Stopping continuous monitoring")
                 break
@@ -92,14 +107,15 @@ class ReleaseNotesAutomator:
             
             logger.info(f"Found {len(new_commits)} new commits to process")
             
-            # Process each commit
-            for commit in new_commits:
-                self._process_single_commit(commit)
+            # Several commits share one LLM request, README write and Teams post
+            if len(new_commits) == 1:
+                self._process_single_commit(new_commits[0])
+            else:
+                self._process_commit_batch(new_commits)
             
             # Update last processed commit
-            if new_commits:
-                self.last_commit_hash = new_commits[0]['hash']
-                self._save_last_processed_commit(self.last_commit_hash)
+            self.last_commit_hash = new_commits[0]['hash']
+            self._save_last_processed_commit(self.last_commit_hash)
                 
         except Exception as e:
             logger.error(f"Error processing new commits: {e}")
@@ -122,7 +138,7 @@ class ReleaseNotesAutomator:
                 self._update_readme(commit, changes, release_notes)
             
             # Send to Teams if configured
-            if self.config.TEAMS_WEBHOOK_URL:
+            if self.settings.teams_webhook_url:
                 self.teams_integration.send_release_notes(
                     commit, release_notes
                 )
@@ -132,6 +148,36 @@ class ReleaseNotesAutomator:
         except Exception as e:
             logger.error(f"Error processing commit {commit['hash'][:8]}: {e}")
     
+    def _process_commit_batch(self, commits):
+        """Process several new commits with one set of release notes."""
+        try:
+            logger.info(f"Processing {len(commits)} commits as one batch")
+            
+            # Extract the changes of every commit before calling the LLM
+            all_changes = []
+            for changes in self._get_changes_for_commits(commits):
+                all_changes.extend(changes)
+            
+            # Generate release notes for the whole batch with one LLM request
+            release_notes = self.llm_handler.generate_comprehensive_release_notes(
+                commits, all_changes
+            )
+            
+            # Update README once, against the newest commit, if any commit warrants it
+            if any(self._should_update_readme(commit, all_changes) for commit in commits):
+                self._update_readme(commits[0], all_changes, release_notes)
+            
+            # Send to Teams if configured
+            if self.settings.teams_webhook_url:
+                self.teams_integration.send_manual_release_notes(
+                    release_notes, commits
+                )
+            
+            logger.info(f"Successfully processed {len(commits)} commits")
+            
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(commits)} commits: {e}")
+    
     def _should_update_readme(self, commit, changes):
         """Determine if README should be updated based on commit changes."""
         # Update README for:
@@ -139,14 +185,8 @@ class ReleaseNotesAutomator:
         # - Major changes
         # - Version updates
         # - Documentation changes
-        
-        significant_keywords = [
-            'feature', 'add', 'new', 'version', 'release',
-            'update', 'improve', 'enhance', 'docs', 'readme'
-        ]
-        
         message_lower = commit['message'].lower()
-        return any(keyword in message_lower for keyword in significant_keywords)
+        return any(keyword in message_lower for keyword in README_UPDATE_KEYWORDS)
     
     def _update_readme(self, commit, changes, release_notes):
         """Update README.md with new information."""
@@ -166,9 +206,10 @@ class ReleaseNotesAutomator:
                 current_readme, commit, changes, release_notes
             )
             
-            # Write updated README
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(updated_readme)
+            # Write updated README atomically so a crash mid-write cannot corrupt it
+            tmp_path = readme_path.with_suffix('.md.tmp')
+            tmp_path.write_text(updated_readme, encoding='utf-8')
+            os.replace(tmp_path, readme_path)
             
             logger.info("README.md updated successfully")
             
@@ -189,8 +230,7 @@ class ReleaseNotesAutomator:
             
             # Generate comprehensive release notes
             all_changes = []
-            for commit in commits:
-                changes = self.git_monitor.get_commit_changes(commit['hash'])
+            for changes in self._get_changes_for_commits(commits):
                 all_changes.extend(changes)
             
             release_notes = self.llm_handler.generate_comprehensive_release_notes(
@@ -207,7 +247,7 @@ class ReleaseNotesAutomator:
             logger.info(f"Release notes saved to {filename}")
             
             # Send to Teams if configured
-            if self.config.TEAMS_WEBHOOK_URL:
+            if self.settings.teams_webhook_url:
                 self.teams_integration.send_manual_release_notes(
                     release_notes, commits
                 )
@@ -1,24 +1,46 @@
 import os
-import openai
+from functools import lru_cache
+import httpx
+from openai import AzureOpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Set OpenAI API configuration
-openai.api_type = 'azure'
-openai.api_base = os.getenv("OPENAI_API_BASE")
-openai.api_version = os.getenv("OPENAI_API_VERSION")
-openai.api_key = os.getenv("OPENAI_API_KEY")
+api_base = os.getenv("OPENAI_API_BASE")
+api_version = os.getenv("OPENAI_API_VERSION")
+api_key = os.getenv("OPENAI_API_KEY")
 deployment_name = os.getenv("OPENAI_DEPLOYMENT_NAME")
 
+# Keep test responses short so the round trip stays fast
+MAX_TOKENS = 250
+
+@lru_cache(maxsize=None)
+def get_client():
+    # Created once and reused so repeated prompts share the same HTTP/2 connection
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=api_base,
+        http_client=httpx.Client(http2=True, limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)),
+    )
+
 def test_openai_llm(prompt):
     try:
-        response = openai.ChatCompletion.create(
-            engine=deployment_name,
-            messages=[{"role": "user", "content": prompt}]
+        response = get_client().chat.completions.create(
+            model=deployment_name,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=MAX_TOKENS,
+            temperature=0.2,
+            top_p=0.9,
+            stream=True
         )
-        return response['choices'][0]['message']['content']
+        parts = []
+        for chunk in response:
+            if chunk.choices:  # Azure sends content-filter chunks with no choices
+                parts.append(chunk.choices[0].delta.content or "")
+        return "".join(parts)
     except Exception as e:
         return f"Error: {e}"
 
@@ -14,11 +14,70 @@ Usage:
 import os
 import re
 import ast
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import Pool
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Iterator, Tuple, Any
 from datetime import datetime
 
 
+# Scanning app/ mostly waits on directory listings, so it runs more threads than there are cores
+WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Below this many files, starting worker processes costs more than parsing serially
+PARALLEL_ANALYSIS_MIN_FILES = 16
+# Imports, definitions and the module docstring almost always sit in this window
+HEADER_READ_SIZE = 64 * 1024
+
+# Generated README sections, replaced on every run
+_APP_PAT = re.compile(r'\n## App Directory\n.*?(?=\n## |$)', re.DOTALL)
+_DEPS_PAT = re.compile(r'\n## Dependencies\n.*?(?=\n## |$)', re.DOTALL)
+# Separates a package name from its version specifier in requirements.txt
+_REQ_SPLIT = re.compile(r'[>=<!=]')
+
+# Analysis results from previous runs, keyed by file path and reused while the
+# file's mtime and size are unchanged. Bump the version whenever the stored
+# analysis format changes so stale entries are dropped.
+README_CACHE_FILE = '.readme_cache.json'
+README_CACHE_VERSION = 4
+
+
+# Never descended into while scanning app/; hidden directories (.venv, .git, ...) are pruned too
+SKIPPED_DIRS = frozenset({'__pycache__'})
+
+
+def scan_directory(directory: str) -> Tuple[List[Path], List[str]]:
+    """List one directory for threaded_walk, returning its Python files and the subdirectories to descend into."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Symlinked directories are neither listed nor followed
+                    if (entry.name not in SKIPPED_DIRS and not entry.name.startswith('.')
+                            and not entry.is_symlink()):
+                        subdirs.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    files.append(Path(entry.path))
+    except OSError:
+        # A subdirectory of app/ that cannot be read, or was deleted mid-scan, adds no files
+        pass
+    return files, subdirs
+
+
+def threaded_walk(root: Path) -> Iterator[Path]:
+    """Find all Python files under root, scanning each directory as a separate thread pool task."""
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        pending = {executor.submit(scan_directory, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                yield from files
+                pending.update(executor.submit(scan_directory, path) for path in subdirs)
+
+
 class PythonFileAnalyzer:
     """Analyzes Python files to extract information about functions and imports."""
     
@@ -29,15 +88,34 @@ class PythonFileAnalyzer:
         self.functions = []
         self.classes = []
         self.docstring = ""
+        # Set when only the first HEADER_READ_SIZE characters could be analyzed
+        self.truncated = False
         
     def analyze(self):
         """Analyze the Python file for imports, functions, and documentation."""
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.content = f.read()
-            
-            # Parse the AST
-            tree = ast.parse(self.content)
+                self.content = f.read(HEADER_READ_SIZE)
+                truncated = bool(f.read(1))
+                
+                # Parse the AST, from only the header for large files. Cutting
+                # at the last line break keeps the window parseable when it
+                # ends between statements; otherwise fall back to the whole file.
+                tree = None
+                if truncated:
+                    last_newline = self.content.rfind('\n')
+                    if last_newline != -1:
+                        self.content = self.content[:last_newline + 1]
+                        try:
+                            tree = ast.parse(self.content)
+                            self.truncated = True
+                        except SyntaxError:
+                            pass
+                    if tree is None:
+                        f.seek(0)
+                        self.content = f.read()
+                if tree is None:
+                    tree = ast.parse(self.content)
             
             # Extract module docstring
             if (tree.body and isinstance(tree.body[0], ast.Expr) and 
@@ -45,50 +123,112 @@ class PythonFileAnalyzer:
                 isinstance(tree.body[0].value.value, str)):
                 self.docstring = tree.body[0].value.value.strip()
             
-            # Walk through the AST
-            for node in ast.walk(tree):
+            # Functions and classes are only listed at the top level; descend
+            # into if/try blocks (e.g. TYPE_CHECKING or optional-import guards).
+            # Other nested code is scanned for imports only.
+            pending = list(reversed(tree.body))
+            while pending:
+                node = pending.pop()
                 if isinstance(node, ast.Import):
                     for alias in node.names:
                         self.imports.add(alias.name.split('.')[0])
                 elif isinstance(node, ast.ImportFrom):
                     if node.module:
                         self.imports.add(node.module.split('.')[0])
-                elif isinstance(node, ast.FunctionDef):
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     func_info = {
                         'name': node.name,
                         'docstring': ast.get_docstring(node) or 'No description available'
                     }
                     self.functions.append(func_info)
+                    self._collect_nested_imports(node.body)
                 elif isinstance(node, ast.ClassDef):
                     class_info = {
                         'name': node.name,
                         'docstring': ast.get_docstring(node) or 'No description available'
                     }
                     self.classes.append(class_info)
+                    self._collect_nested_imports(node.body)
+                elif isinstance(node, ast.If):
+                    pending.extend(reversed(node.body + node.orelse))
+                elif isinstance(node, ast.Try):
+                    blocks = node.body + [stmt for handler in node.handlers for stmt in handler.body]
+                    pending.extend(reversed(blocks + node.orelse + node.finalbody))
+                else:
+                    self._collect_nested_imports([node])
                     
         except Exception as e:
             print(f"Error analyzing {self.file_path}: {e}")
     
+    def _collect_nested_imports(self, statements):
+        """Add imports found anywhere in nested statement blocks, e.g. lazy imports inside functions."""
+        # Only statement lists are followed; expressions cannot contain imports
+        pending = list(statements)
+        while pending:
+            node = pending.pop()
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports.add(alias.name.split('.')[0])
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    self.imports.add(node.module.split('.')[0])
+            else:
+                for field in ('body', 'orelse', 'finalbody', 'handlers', 'cases'):
+                    block = getattr(node, field, None)
+                    if isinstance(block, list):
+                        pending.extend(block)
+    
+    def to_summary(self) -> Dict[str, Any]:
+        """Return the analysis results as a picklable, JSON-serializable dict, without the file content."""
+        return {
+            'file_path': str(self.file_path),
+            'imports': sorted(self.imports),
+            'functions': self.functions,
+            'classes': self.classes,
+            'docstring': self.docstring,
+            'truncated': self.truncated,
+        }
+    
+    @classmethod
+    def from_summary(cls, summary: Dict[str, Any]) -> 'PythonFileAnalyzer':
+        """Rebuild an analyzer from the dict produced by to_summary()."""
+        analyzer = cls(summary['file_path'])
+        analyzer.imports = set(summary['imports'])
+        analyzer.functions = summary['functions']
+        analyzer.classes = summary['classes']
+        analyzer.docstring = summary['docstring']
+        analyzer.truncated = summary['truncated']
+        return analyzer
+    
     def get_summary(self) -> str:
         """Generate a summary of the file."""
         if self.docstring:
             # Extract first line of docstring as summary
-            first_line = self.docstring.split('\n')[0].strip()
+            first_line = self.docstring.partition('\n')[0].strip()
             if first_line:
                 return first_line
         
         # Fallback to analyzing functions and classes
         if self.functions or self.classes:
             purpose_parts = []
+            # A truncated analysis only saw part of the file, so counts are lower bounds
+            contains = "Contains at least" if self.truncated else "Contains"
             if self.functions:
-                purpose_parts.append(f"Contains {len(self.functions)} function(s)")
+                purpose_parts.append(f"{contains} {len(self.functions)} function(s)")
             if self.classes:
-                purpose_parts.append(f"Contains {len(self.classes)} class(es)")
+                purpose_parts.append(f"{contains} {len(self.classes)} class(es)")
             return " and ".join(purpose_parts)
         
         return "Python module"
 
 
+def analyze_one(path: str) -> Dict[str, Any]:
+    """Analyze a single Python file; top-level so it can run in a worker process."""
+    analyzer = PythonFileAnalyzer(path)
+    analyzer.analyze()
+    return analyzer.to_summary()
+
+
 class ReadmeUpdater:
     """Updates README.md with app directory analysis."""
     
@@ -97,15 +237,27 @@ class ReadmeUpdater:
         self.readme_path = Path(readme_path)
         self.python_files = []
         self.all_dependencies = set()
-        self.builtin_modules = {
-            'os', 'sys', 'datetime', 'time', 'json', 'csv', 'math', 'random',
-            'collections', 'itertools', 'functools', 'operator', 'pathlib',
-            'typing', 'enum', 'dataclasses', 'logging', 'argparse', 'configparser',
-            're', 'urllib', 'http', 'socket', 'threading', 'multiprocessing',
-            'subprocess', 'tempfile', 'shutil', 'glob', 'fnmatch', 'linecache',
-            'pickle', 'copy', 'pprint', 'textwrap', 'string', 'difflib', 'hashlib',
-            'hmac', 'uuid', 'ast', 'dis', 'inspect', 'gc', 'weakref', 'abc'
-        }
+        self.builtin_modules = sys.stdlib_module_names
+        self.cache_path = self.readme_path.with_name(README_CACHE_FILE)
+        self.analysis_cache = self.load_analysis_cache()
+    
+    def load_analysis_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load analysis results from the last run, ignoring missing or outdated caches."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(cache, dict) or cache.get('version') != README_CACHE_VERSION:
+            return {}
+        return cache.get('files', {})
+    
+    def save_analysis_cache(self):
+        """Atomically write the analysis results back to disk."""
+        tmp_path = self.cache_path.with_name(README_CACHE_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': README_CACHE_VERSION, 'files': self.analysis_cache}, f)
+        os.replace(tmp_path, self.cache_path)
     
     def scan_app_directory(self):
         """Scan the app directory for Python files."""
@@ -115,14 +267,45 @@ class ReadmeUpdater:
         
         print(f"Scanning {self.app_dir} for Python files...")
         
-        for py_file in self.app_dir.glob('**/*.py'):
-            if py_file.name != '__pycache__':
+        # Files whose mtime and size match the cache reuse their earlier analysis
+        summaries = {}
+        stats = {}
+        paths = []
+        for py_file in threaded_walk(self.app_dir):
+            path = str(py_file)
+            try:
+                st = py_file.stat()
+            except OSError:
+                st = None
+            else:
+                stats[path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+            cached = self.analysis_cache.get(path)
+            if st is not None and cached and cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+                summaries[path] = cached['summary']
+            else:
                 print(f"Analyzing {py_file}...")
-                analyzer = PythonFileAnalyzer(py_file)
-                analyzer.analyze()
-                
-                self.python_files.append(analyzer)
-                self.all_dependencies.update(analyzer.imports)
+                summaries[path] = None
+                paths.append(path)
+        
+        # Parsing is CPU bound, so large trees are spread across processes
+        if len(paths) >= PARALLEL_ANALYSIS_MIN_FILES:
+            with Pool() as pool:
+                chunksize = max(1, min(32, len(paths) // (4 * (os.cpu_count() or 1))))
+                results = pool.map(analyze_one, paths, chunksize=chunksize)
+        else:
+            results = [analyze_one(path) for path in paths]
+        summaries.update(zip(paths, results))
+        
+        # Files that no longer exist drop out of the cache
+        self.analysis_cache = {
+            path: {**stats[path], 'summary': summary}
+            for path, summary in summaries.items() if path in stats
+        }
+        
+        for summary in summaries.values():
+            analyzer = PythonFileAnalyzer.from_summary(summary)
+            self.python_files.append(analyzer)
+            self.all_dependencies.update(analyzer.imports)
     
     def get_third_party_dependencies(self) -> Set[str]:
         """Filter out built-in modules to get third-party dependencies."""
@@ -140,7 +323,7 @@ class ReadmeUpdater:
                         line = line.strip()
                         if line and not line.startswith('#'):
                             # Extract package name (before version specifier)
-                            package = re.split(r'[>=<!=]', line)[0].strip()
+                            package = _REQ_SPLIT.split(line, 1)[0].strip()
                             dependencies.add(package)
             except Exception as e:
                 print(f"Error reading requirements.txt: {e}")
@@ -152,34 +335,44 @@ class ReadmeUpdater:
         if not self.python_files:
             return "\n## App Directory\n\nNo Python files found in the app directory.\n"
         
-        section = "\n## App Directory\n\n"
-        section += "The `app` directory contains the following Python files:\n\n"
+        parts = ["\n## App Directory\n\n",
+                 "The `app` directory contains the following Python files:\n\n"]
         
         for analyzer in sorted(self.python_files, key=lambda x: x.file_path.name):
-            relative_path = analyzer.file_path.relative_to(Path.cwd())
-            section += f"### {relative_path}\n\n"
-            section += f"**Purpose:** {analyzer.get_summary()}\n\n"
-            
-            if analyzer.functions:
-                section += "**Functions:**\n"
-                for func in analyzer.functions:
-                    # Clean up docstring for display
-                    doc_summary = func['docstring'].split('\n')[0].strip()
-                    section += f"- `{func['name']}()`: {doc_summary}\n"
-                section += "\n"
-            
-            if analyzer.classes:
-                section += "**Classes:**\n"
-                for cls in analyzer.classes:
-                    doc_summary = cls['docstring'].split('\n')[0].strip()
-                    section += f"- `{cls['name']}`: {doc_summary}\n"
-                section += "\n"
+            parts.append(self.render_file_section(analyzer))
         
-        return section
+        return "".join(parts)
+    
+    def render_file_section(self, analyzer: PythonFileAnalyzer) -> str:
+        """Render the README section describing a single file."""
+        relative_path = analyzer.file_path.relative_to(Path.cwd())
+        parts = [f"### {relative_path}\n\n",
+                 f"**Purpose:** {analyzer.get_summary()}\n\n"]
+        
+        if analyzer.truncated:
+            parts.append(f"*Only the first {HEADER_READ_SIZE // 1024} KB of this file was analyzed; "
+                         "later functions, classes and imports are not listed.*\n\n")
+        
+        if analyzer.functions:
+            parts.append("**Functions:**\n")
+            for func in analyzer.functions:
+                # Clean up docstring for display
+                doc_summary = func['docstring'].partition('\n')[0].strip()
+                parts.append(f"- `{func['name']}()`: {doc_summary}\n")
+            parts.append("\n")
+        
+        if analyzer.classes:
+            parts.append("**Classes:**\n")
+            for cls in analyzer.classes:
+                doc_summary = cls['docstring'].partition('\n')[0].strip()
+                parts.append(f"- `{cls['name']}`: {doc_summary}\n")
+            parts.append("\n")
+        
+        return "".join(parts)
     
     def generate_dependencies_section(self) -> str:
         """Generate the dependencies section for README."""
-        section = "\n## Dependencies\n\n"
+        parts = ["\n## Dependencies\n\n"]
         
         # Get third-party dependencies from code analysis
         code_deps = self.get_third_party_dependencies()
@@ -191,23 +384,23 @@ class ReadmeUpdater:
         all_deps = code_deps.union(req_deps)
         
         if not all_deps:
-            section += "This project uses only Python standard library modules.\n"
+            parts.append("This project uses only Python standard library modules.\n")
         else:
-            section += "This project depends on the following third-party packages:\n\n"
+            parts.append("This project depends on the following third-party packages:\n\n")
             for dep in sorted(all_deps):
-                section += f"- `{dep}`"
+                parts.append(f"- `{dep}`")
                 if dep in req_deps:
-                    section += " (listed in requirements.txt)"
+                    parts.append(" (listed in requirements.txt)")
                 if dep in code_deps:
-                    section += " (imported in code)"
-                section += "\n"
+                    parts.append(" (imported in code)")
+                parts.append("\n")
             
-            section += "\nTo install dependencies, run:\n"
-            section += "```bash\n"
-            section += "pip install -r requirements.txt\n"
-            section += "```\n"
+            parts.append("\nTo install dependencies, run:\n")
+            parts.append("```bash\n")
+            parts.append("pip install -r requirements.txt\n")
+            parts.append("```\n")
         
-        return section
+        return "".join(parts)
     
     def update_readme(self):
         """Update the README.md file with app directory and dependencies information."""
@@ -224,12 +417,8 @@ class ReadmeUpdater:
         deps_section = self.generate_dependencies_section()
         
         # Remove existing sections if they exist
-        # Pattern to match our generated sections
-        app_pattern = r'\n## App Directory\n.*?(?=\n## |$)'
-        deps_pattern = r'\n## Dependencies\n.*?(?=\n## |$)'
-        
-        readme_content = re.sub(app_pattern, '', readme_content, flags=re.DOTALL)
-        readme_content = re.sub(deps_pattern, '', readme_content, flags=re.DOTALL)
+        readme_content = _APP_PAT.sub('', readme_content)
+        readme_content = _DEPS_PAT.sub('', readme_content)
         
         # Add new sections at the end
         updated_content = readme_content.rstrip() + app_section + deps_section
@@ -238,9 +427,12 @@ class ReadmeUpdater:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         updated_content += f"\n---\n*This README was automatically updated on {timestamp} by update_readme.py*\n"
         
-        # Write updated README
-        with open(self.readme_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        # Write updated README to a sibling temp file and swap it in, so an
+        # interrupted run never leaves a half-written README behind
+        tmp_path = self.readme_path.with_suffix('.md.tmp')
+        tmp_path.write_text(updated_content, encoding='utf-8')
+        os.replace(tmp_path, self.readme_path)
+        self.save_analysis_cache()
         
         print(f"README.md has been updated with {len(self.python_files)} Python files and {len(self.get_third_party_dependencies())} third-party dependencies.")
 